@@ -1,11 +1,15 @@
+import time
+
+# 스크립트 실행 시작 시각 (첫 화면 표시/재실행 시간 측정용)
+_RUN_START = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
 import datetime
-import yfinance as yf
-from supabase_client import SupabaseClient
 import os
 from pathlib import Path
 
+# yfinance, pandas, supabase는 무거우므로 실제로 필요할 때 import
+
 # 페이지 설정
 st.set_page_config(
     page_title="Stock Journal Manager",
@@ -71,13 +75,46 @@ def save_env_file(url: str, key: str):
         for k, v in env_vars.items():
             f.write(f"{k}={v}\n")
 
+    # 모든 세션이 새 설정을 읽도록 캐시 무효화
+    load_config.clear()
     return True
 
+@st.cache_resource(show_spinner=False)
+def load_config():
+    """.env/환경변수 설정을 프로세스 전체에서 한 번만 읽어 공유"""
+    env_vars = load_env_file()
+    return {
+        "SUPABASE_URL": env_vars.get("SUPABASE_URL", os.getenv("SUPABASE_URL", "")),
+        "SUPABASE_KEY": env_vars.get("SUPABASE_KEY", os.getenv("SUPABASE_KEY", "")),
+    }
+
+@st.cache_resource(show_spinner=False)
+def get_client(url, key):
+    """URL/Key별 Supabase 클라이언트를 모든 세션이 공유 (연결 테스트 통과 시에만 캐시)"""
+    from supabase_client import SupabaseClient
+
+    client = SupabaseClient(url, key)
+    client.test_connection()
+    return client
+
+@st.cache_resource(show_spinner=False)
+def get_process_timing():
+    """프로세스 최초 실행 시각과 첫 화면 표시 시간 (모든 세션 공유)"""
+    return {"started": _RUN_START, "first_render": None}
+
+def record_timing(name, started):
+    """
+    구간 실행 시간(ms)을 해당 구간 안에 표시
+
+    탭은 fragment로 따로 재실행되어 사이드바 리포트가 다시 그려지지 않으므로
+    각 탭의 시간은 탭 안에서 직접 표시합니다.
+    """
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.caption(f"⏱️ {name} 실행: {elapsed_ms:,.0f} ms")
+
 def init_connection(url, key):
     try:
-        client = SupabaseClient(url, key)
-        client.test_connection()
-        st.session_state.supabase_client = client
+        st.session_state.supabase_client = get_client(url, key)
         st.success("✅ Supabase 연결 성공!")
         return True
     except Exception as e:
@@ -91,17 +128,34 @@ def init_connection(url, key):
         """)
         return False
 
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_current_price(ticker):
+    import yfinance as yf
+
     try:
         stock = yf.Ticker(ticker)
         return stock.fast_info.last_price
     except:
         return None
 
-# --- .env 파일에서 기본값 로드 ---
-env_vars = load_env_file()
-default_url = env_vars.get("SUPABASE_URL", os.getenv("SUPABASE_URL", ""))
-default_key = env_vars.get("SUPABASE_KEY", os.getenv("SUPABASE_KEY", ""))
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_ticker_history(url, key, ticker, limit=5):
+    """티커별 최근 매매 기록 (ticker = … ORDER BY trade_date DESC)"""
+    return get_client(url, key).query_trades(ticker=ticker, limit=limit)
+
+# --- .env 파일에서 기본값 로드 (캐시된 설정) ---
+config = load_config()
+default_url = config["SUPABASE_URL"]
+default_key = config["SUPABASE_KEY"]
+
+# 저장된 설정이 있으면 세션 시작 시 공유 클라이언트에 자동 연결
+if 'auto_connect_tried' not in st.session_state:
+    st.session_state.auto_connect_tried = True
+    if default_url and default_key:
+        try:
+            st.session_state.supabase_client = get_client(default_url, default_key)
+        except Exception:
+            pass
 
 # --- Sidebar: 설정 ---
 with st.sidebar:
@@ -136,15 +190,11 @@ with st.sidebar:
 # --- Main Interface ---
 st.title("📈 Stock Journal Manager")
 
-if not st.session_state.supabase_client:
-    st.warning("👈 왼쪽 사이드바에서 Supabase 설정을 먼저 완료해주세요.")
-    st.stop()
-
-# 탭 구성
-tab1, tab2, tab3 = st.tabs(["📝 매매 기록 (Record)", "📊 기록 조회 (View)", "🌞 일일 루틴 (Daily)"])
-
 # === Tab 1: 매매 기록 ===
-with tab1:
+# 각 탭은 fragment로 분리되어, 탭 안의 위젯 조작 시 해당 탭만 다시 실행됨
+@st.fragment
+def render_record_tab():
+    started = time.perf_counter()
     st.header("새로운 매매 기록")
 
     col1, col2 = st.columns(2)
@@ -163,6 +213,21 @@ with tab1:
             else:
                 st.caption("⚠️ 현재가 조회 실패 혹은 잘못된 티커")
 
+            # 같은 종목의 최근 매매 기록
+            try:
+                client = st.session_state.supabase_client
+                history = fetch_ticker_history(client.url, client.key, ticker)
+            except Exception:
+                history = []
+            if history:
+                with st.expander(f"📒 '{ticker}' 최근 매매 {len(history)}건"):
+                    for record in history:
+                        trade_date = (record.get("trade_date") or "")[:16].replace("T", " ")
+                        st.caption(
+                            f"{trade_date} {record.get('trade_type', '')} "
+                            f"{record.get('price') or 0:,.2f} × {record.get('quantity') or 0}"
+                        )
+
     with col2:
         trade_type = st.selectbox("구분", ["매수", "매도"])
         date = st.date_input("매매일자", datetime.date.today())
@@ -270,12 +335,100 @@ with tab1:
                     }
 
                     st.session_state.supabase_client.create_trade(data)
+                    fetch_ticker_history.clear()
                     st.success("✅ 저장 완료!")
                 except Exception as e:
                     st.error(f"저장 실패: {e}")
 
+    record_timing("Record 탭", started)
+
 # === Tab 2: 기록 조회 ===
-with tab2:
+# 변경 피드로 갱신된 결과를 주기적으로 다시 그림 (DB 재조회 없음)
+LIVE_REFRESH_SECONDS = 3
+
+@st.cache_resource(show_spinner=False)
+def get_change_feed(url, key):
+    """trades/daily_notes 변경 피드를 모든 세션이 공유 (Realtime 불가 시 updated_at 폴링)"""
+    from change_feed import create_change_feed
+
+    return create_change_feed(get_client(url, key))
+
+def trade_matches(record, keyword):
+    """query_trades 조건과 같은 기준으로 결과 포함 여부 판단"""
+    if not keyword:
+        return True
+    keyword = keyword.lower()
+    return keyword in (record.get("ticker") or "").lower() or keyword in (record.get("stock_name") or "").lower()
+
+def load_trade_results(keyword):
+    """조회 결과를 변경 피드에 연결된 LiveResultSet으로 세션에 저장"""
+    from change_feed import LiveResultSet
+
+    client = st.session_state.supabase_client
+    results = client.query_trades(search_keyword=keyword)
+
+    previous = st.session_state.get("trade_results")
+    if previous:
+        previous.unbind()
+
+    live = LiveResultSet(
+        "trades",
+        match=lambda record: trade_matches(record, keyword),
+        sort_key="trade_date",
+        limit=100
+    )
+    live.load(results)
+    try:
+        live.bind(get_change_feed(client.url, client.key))
+    except Exception as e:
+        st.caption(f"⚠️ 실시간 반영 불가: {e}")
+
+    st.session_state.trade_results = live
+    st.session_state.trade_results_keyword = keyword
+
+def render_trade_results(results):
+    if not results:
+        st.info("데이터가 없습니다.")
+        return
+
+    import pandas as pd
+
+    # 데이터 가공
+    rows = []
+    for record in results:
+        try:
+            trade_date = record.get("trade_date", "")
+            if trade_date:
+                trade_date = trade_date[:16].replace("T", " ")
+
+            rows.append({
+                "Date": trade_date,
+                "Type": record.get("trade_type", ""),
+                "Ticker": record.get("ticker", ""),
+                "Name": record.get("stock_name", ""),
+                "Price": record.get("price", 0),
+                "Qty": record.get("quantity", 0),
+                "Mood": record.get("mood", ""),
+                "Reason": record.get("reason", ""),
+                "Image": record.get("image_url", "")
+            })
+        except Exception as parse_err:
+            continue
+
+    df = pd.DataFrame(rows)
+    st.dataframe(df, use_container_width=True)
+
+    # 이미지가 있는 기록 표시
+    records_with_images = [r for r in rows if r.get("Image")]
+    if records_with_images:
+        st.markdown("#### 📷 첨부 이미지")
+        for r in records_with_images[:5]:  # 최근 5개만 표시
+            with st.expander(f"{r['Date']} - {r['Ticker']} ({r['Type']})"):
+                st.image(r["Image"], use_container_width=True)
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_view_tab():
+    started = time.perf_counter()
     st.header("📋 매매 일지 조회")
 
     search_keyword = st.text_input("검색 (티커/종목명)", "")
@@ -283,55 +436,48 @@ with tab2:
     if st.button("조회 하기"):
         with st.spinner("데이터 불러오는 중..."):
             try:
-                results = st.session_state.supabase_client.query_trades(
-                    search_keyword=search_keyword.upper() if search_keyword else None
-                )
-
-                if not results:
-                    st.info("데이터가 없습니다.")
-                else:
-                    # 데이터 가공
-                    rows = []
-                    for record in results:
-                        # DAILY_NOTE는 일일 루틴이므로 제외
-                        if record.get("ticker") == "DAILY_NOTE":
-                            continue
-                        try:
-                            trade_date = record.get("trade_date", "")
-                            if trade_date:
-                                trade_date = trade_date[:16].replace("T", " ")
-
-                            rows.append({
-                                "Date": trade_date,
-                                "Type": record.get("trade_type", ""),
-                                "Ticker": record.get("ticker", ""),
-                                "Name": record.get("stock_name", ""),
-                                "Price": record.get("price", 0),
-                                "Qty": record.get("quantity", 0),
-                                "Mood": record.get("mood", ""),
-                                "Reason": record.get("reason", ""),
-                                "Image": record.get("image_url", "")
-                            })
-                        except Exception as parse_err:
-                            continue
-
-                    df = pd.DataFrame(rows)
-                    st.dataframe(df, use_container_width=True)
-
-                    # 이미지가 있는 기록 표시
-                    records_with_images = [r for r in rows if r.get("Image")]
-                    if records_with_images:
-                        st.markdown("#### 📷 첨부 이미지")
-                        for r in records_with_images[:5]:  # 최근 5개만 표시
-                            with st.expander(f"{r['Date']} - {r['Ticker']} ({r['Type']})"):
-                                st.image(r["Image"], use_container_width=True)
-
+                load_trade_results(search_keyword.upper() if search_keyword else None)
             except Exception as e:
                 st.error(f"조회 중 오류: {e}")
 
+    live = st.session_state.get("trade_results")
+    if live:
+        try:
+            # 제한된 결과에서 행이 삭제되면 범위 밖 행을 채우기 위해 재조회
+            if live.needs_reload:
+                load_trade_results(st.session_state.trade_results_keyword)
+                live = st.session_state.trade_results
+            if live.connected:
+                st.caption("🟢 다른 기기의 변경 사항이 자동으로 반영됩니다.")
+            render_trade_results(live.rows())
+        except Exception as e:
+            st.error(f"조회 중 오류: {e}")
+
+    record_timing("View 탭", started)
+
 # === Tab 3: 일일 루틴 ===
-with tab3:
+def save_daily_summary(note_date, summary, theme):
+    """일일 요약을 같은 날짜의 daily_notes 노트 뒤에 덧붙여 저장 (Daily Notes와 같은 변경분 저장 경로)"""
+    from note_patch import make_text_patch, save_note_changes
+
+    client = st.session_state.supabase_client
+    note = client.get_daily_note_by_date(note_date) or {}
+    content = note.get("content") or ""
+    new_content = f"{content}\n\n{summary}" if content else summary
+
+    changes = {"base_revision": note.get("revision", 0), "content_patch": [make_text_patch(content, new_content)]}
+    theme = (theme or "").strip()
+    if theme.lstrip("#"):
+        tag = theme if theme.startswith("#") else f"#{theme}"
+        changes["tags"] = {"add": [tag], "remove": []}
+
+    return save_note_changes(client, note_date, changes)
+
+@st.fragment
+def render_daily_tab():
+    started = time.perf_counter()
     st.header("🌞 Daily Routine & Summary")
+    st.caption("일일 요약은 Daily Notes와 같은 날짜별 노트(daily_notes)에 덧붙여 저장됩니다.")
 
     summary_date = st.date_input("날짜", datetime.date.today(), key="daily_date")
     daily_theme = st.text_input("오늘의 주도 테마", key="daily_theme")
@@ -343,20 +489,40 @@ with tab3:
         else:
             with st.spinner("저장 중..."):
                 try:
-                    data = {
-                        "stock_name": f"Daily Summary - {summary_date}",
-                        "ticker": "DAILY_NOTE",
-                        "trade_date": summary_date.isoformat(),
-                        "trade_type": "일일요약",
-                        "price": 0,
-                        "quantity": 0,
-                        "mood": None,
-                        "reason": daily_summary,
-                        "themes": [daily_theme] if daily_theme else [],
-                        "image_url": None
-                    }
-
-                    st.session_state.supabase_client.create_trade(data)
+                    save_daily_summary(summary_date.isoformat(), daily_summary, daily_theme)
                     st.success("✅ 일일 요약 저장 완료!")
                 except Exception as e:
                     st.error(f"저장 실패: {e}")
+
+    record_timing("Daily 탭", started)
+
+def render_timing_report():
+    """시작/재실행 시간 리포트 (사이드바)"""
+    process = get_process_timing()
+    total_ms = (time.perf_counter() - _RUN_START) * 1000
+    if process["first_render"] is None:
+        process["first_render"] = (time.perf_counter() - process["started"]) * 1000
+
+    with st.sidebar.expander("⏱️ 실행 시간"):
+        st.caption(f"첫 화면 표시 (프로세스 시작 후): {process['first_render']:,.0f} ms")
+        st.caption(f"이번 전체 실행: {total_ms:,.0f} ms")
+        st.caption("탭별 실행 시간은 각 탭 하단에 표시됩니다.")
+
+if not st.session_state.supabase_client:
+    st.warning("👈 왼쪽 사이드바에서 Supabase 설정을 먼저 완료해주세요.")
+    render_timing_report()
+    st.stop()
+
+# 탭 구성
+tab1, tab2, tab3 = st.tabs(["📝 매매 기록 (Record)", "📊 기록 조회 (View)", "🌞 일일 루틴 (Daily)"])
+
+with tab1:
+    render_record_tab()
+
+with tab2:
+    render_view_tab()
+
+with tab3:
+    render_daily_tab()
+
+render_timing_report()
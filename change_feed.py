@@ -0,0 +1,569 @@
+"""
+trades / daily_notes 변경 피드
+
+다른 기기에서 입력한 내용을 다시 조회하지 않고 반영하기 위한 모듈입니다.
+
+    - RealtimeSource: Supabase Realtime (postgres_changes) 구독
+    - TailPoller: Realtime을 쓸 수 없을 때 (updated_at, id) 커서 이후 변경분만 폴링
+    - LocalTables: 테스트용 로컬 대체 저장소 (소스/폴링 대상 모두로 사용 가능)
+
+변경 이벤트는 Supabase Realtime 페이로드와 같은 형태의 딕셔너리입니다.
+    {"table": "trades", "type": "INSERT" | "UPDATE" | "DELETE", "record": {...}, "old_record": {...}}
+
+LiveResultSet은 조회 결과를 메모리에 들고 있다가 이벤트를 받아 증분 반영합니다.
+"""
+import asyncio
+import logging
+import threading
+import uuid
+import weakref
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("trades", "daily_notes")
+
+Change = Dict[str, Any]
+
+
+class ChangeFeed:
+    """
+    변경 소스에서 받은 이벤트를 테이블별 구독자에게 전달합니다.
+
+    소스는 start(emit) / stop()을 제공하며, 삭제 감지를 위해
+    track(table, owner, ids) / untrack(table, owner)를 제공할 수도 있습니다 (TailPoller).
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._subscribers: Dict[str, List[Callable[[Change], None]]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.running = False
+
+    def start(self) -> "ChangeFeed":
+        if not self.running:
+            self.source.start(self._dispatch)
+            self.running = True
+        return self
+
+    def stop(self):
+        if self.running:
+            self.source.stop()
+            self.running = False
+
+    @property
+    def live(self) -> bool:
+        """소스가 변경을 받고 있는지 여부 (Realtime이 끊겼다가 폴링으로 넘어가도 True)"""
+        return self.running and getattr(self.source, "live", True)
+
+    def subscribe(self, table: str, callback: Callable[[Change], None]) -> Callable[[], None]:
+        """테이블 변경 구독. 구독 해제 함수를 반환합니다."""
+        with self._lock:
+            self._subscribers[table].append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers[table]:
+                    self._subscribers[table].remove(callback)
+
+        return unsubscribe
+
+    def track(self, table: str, owner: str, ids: Iterable[str]):
+        """owner가 들고 있는 행 ID(삭제 감지 대상)를 소스에 알립니다. 이전 목록은 교체됩니다."""
+        track = getattr(self.source, "track", None)
+        if track:
+            track(table, owner, ids)
+
+    def untrack(self, table: str, owner: str):
+        """owner의 삭제 감지 대상을 제거합니다."""
+        untrack = getattr(self.source, "untrack", None)
+        if untrack:
+            untrack(table, owner)
+
+    def _dispatch(self, change: Change):
+        with self._lock:
+            callbacks = list(self._subscribers.get(change.get("table"), []))
+        for callback in callbacks:
+            try:
+                callback(change)
+            except Exception:
+                logger.exception("변경 피드 구독자 오류")
+
+
+class LiveResultSet:
+    """
+    변경 이벤트로 갱신되는 조회 결과
+
+    Args:
+        table: 대상 테이블
+        match: 결과에 포함될 행인지 판단하는 함수 (기본: 모두 포함)
+        sort_key: 정렬 기준 컬럼
+        descending: 내림차순 여부
+        limit: 최대 행 수 (조회 시 limit과 동일하게)
+    """
+
+    def __init__(
+        self,
+        table: str,
+        match: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        sort_key: str = "created_at",
+        descending: bool = True,
+        limit: Optional[int] = None
+    ):
+        self.table = table
+        self.match = match or (lambda record: True)
+        self.sort_key = sort_key
+        self.descending = descending
+        self.limit = limit
+        self.version = 0
+        # 제한된 결과에서 행이 빠지면 범위 밖의 행이 들어와야 하므로 재조회 필요
+        self.needs_reload = False
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._key = uuid.uuid4().hex
+        self._feed: Optional[ChangeFeed] = None
+        self._release: Optional[weakref.finalize] = None
+
+    def bind(self, feed: ChangeFeed) -> "LiveResultSet":
+        """피드를 구독합니다. 결과 객체가 사라지면 구독과 삭제 감지 대상도 자동 해제됩니다."""
+        if self._feed is not None:
+            self.unbind()
+        ref = weakref.ref(self)
+
+        def on_change(change):
+            result_set = ref()
+            if result_set is not None:
+                result_set.apply(change)
+
+        unsubscribe = feed.subscribe(self.table, on_change)
+        self._feed = feed
+        self._release = weakref.finalize(self, _release_binding, feed, self.table, self._key, unsubscribe)
+        self._track()
+        return self
+
+    @property
+    def bound(self) -> bool:
+        """피드를 구독 중인지 여부"""
+        return self._feed is not None
+
+    @property
+    def connected(self) -> bool:
+        """구독 중인 피드가 실제로 변경을 받고 있어 실시간 반영 중인지 여부"""
+        return self._feed is not None and self._feed.live
+
+    def unbind(self):
+        if self._release:
+            self._release()
+        self._feed = None
+        self._release = None
+
+    def load(self, rows: List[Dict[str, Any]]):
+        """조회 결과로 전체를 교체합니다."""
+        with self._lock:
+            self._rows = {row["id"]: row for row in rows if row.get("id")}
+            self.needs_reload = False
+            self.version += 1
+        self._track()
+
+    def apply(self, change: Change) -> bool:
+        """변경 이벤트를 반영하고, 결과가 바뀌었으면 True를 반환합니다."""
+        if change.get("table") != self.table:
+            return False
+
+        record = change.get("record") or {}
+        row_id = record.get("id") or (change.get("old_record") or {}).get("id")
+        if not row_id:
+            return False
+
+        with self._lock:
+            was_full = self.limit is not None and len(self._rows) >= self.limit
+
+            if change.get("type") == "DELETE" or not self.match(record):
+                if row_id not in self._rows:
+                    return False
+                del self._rows[row_id]
+                if was_full:
+                    self.needs_reload = True
+            else:
+                added = row_id not in self._rows
+                self._rows[row_id] = record
+                if self.limit is not None and len(self._rows) > self.limit:
+                    for row in self._sorted()[self.limit:]:
+                        del self._rows[row["id"]]
+                if added and row_id not in self._rows:
+                    # 범위 밖이라 바로 잘려 나간 행: 결과는 그대로
+                    return False
+
+            self.version += 1
+        self._track()
+        return True
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """정렬된 결과 목록"""
+        with self._lock:
+            return self._sorted()
+
+    def _track(self):
+        if self._feed:
+            with self._lock:
+                ids = list(self._rows)
+            self._feed.track(self.table, self._key, ids)
+
+    def _sorted(self) -> List[Dict[str, Any]]:
+        return sorted(
+            self._rows.values(),
+            key=lambda row: row.get(self.sort_key) or "",
+            reverse=self.descending
+        )
+
+
+def _release_binding(feed: ChangeFeed, table: str, key: str, unsubscribe: Callable[[], None]):
+    unsubscribe()
+    feed.untrack(table, key)
+
+
+class RealtimeSource:
+    """
+    Supabase Realtime(postgres_changes) 구독 소스
+
+    realtime 클라이언트는 비동기 전용이므로 별도 스레드의 이벤트 루프에서 실행합니다.
+    채널이 SUBSCRIBED 상태가 되어야 start()가 반환되며, 이후 채널 오류나 소켓 끊김이
+    감지되면 fallback 소스(TailPoller)로 전환합니다.
+
+    Args:
+        fallback: 연결이 끊겼을 때 이어서 사용할 폴링 소스.
+            start() 시점에 커서를 잡아 두므로 끊긴 동안의 변경분도 받습니다.
+        health_interval: 소켓 연결 상태 확인 주기 (초)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        tables: Iterable[str] = TABLES,
+        connect_timeout: float = 10.0,
+        fallback: Optional["TailPoller"] = None,
+        health_interval: float = 1.0
+    ):
+        self.url = url
+        self.key = key
+        self.tables = list(tables)
+        self.connect_timeout = connect_timeout
+        self.fallback = fallback
+        self.health_interval = health_interval
+        self.subscribed = False
+        self._fallback_active = False
+        self._closing = threading.Event()
+        self._socket = None
+        self._error = None
+        self._emit = None
+
+    @property
+    def live(self) -> bool:
+        """Realtime 구독 중이거나 폴링으로 전환되어 변경을 계속 받는 중인지 여부"""
+        return self.subscribed or self._fallback_active
+
+    def start(self, emit: Callable[[Change], None]):
+        self._emit = emit
+        self._closing.clear()
+        if self.fallback:
+            self.fallback.prime()
+
+        ready = threading.Event()
+        threading.Thread(target=self._run, args=(ready,), daemon=True).start()
+
+        if not ready.wait(self.connect_timeout):
+            self._closing.set()
+            raise Exception("Realtime 연결 시간 초과")
+        if self._error:
+            self._closing.set()
+            raise Exception(f"Realtime 연결 실패: {self._error}")
+
+    def stop(self):
+        self._closing.set()
+        self.subscribed = False
+        if self._fallback_active:
+            self.fallback.stop()
+            self._fallback_active = False
+
+    def track(self, table: str, owner: str, ids: Iterable[str]):
+        if self.fallback:
+            self.fallback.track(table, owner, ids)
+
+    def untrack(self, table: str, owner: str):
+        if self.fallback:
+            self.fallback.untrack(table, owner)
+
+    def _run(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._listen(ready))
+        except Exception as e:
+            if ready.is_set():
+                self._lost(e)
+            else:
+                self._error = e
+                ready.set()
+        finally:
+            loop.close()
+
+    async def _listen(self, ready: threading.Event):
+        from realtime import AsyncRealtimeClient
+
+        realtime_url = self.url.replace("http", "ws", 1).rstrip("/") + "/realtime/v1"
+        self._socket = AsyncRealtimeClient(realtime_url, self.key)
+        await self._socket.connect()
+
+        def on_subscribe(status, error=None):
+            status = getattr(status, "value", status)
+            if status == "SUBSCRIBED":
+                self.subscribed = True
+                ready.set()
+            elif status in ("CHANNEL_ERROR", "TIMED_OUT", "CLOSED"):
+                reason = error or status
+                if ready.is_set():
+                    self._lost(reason)
+                else:
+                    self._error = reason
+                    self._closing.set()
+                    ready.set()
+
+        channel = self._socket.channel(f"trading-daily-note-{uuid.uuid4().hex[:8]}")
+        for table in self.tables:
+            channel.on_postgres_changes("*", schema="public", table=table, callback=self._on_change)
+        await channel.subscribe(on_subscribe)
+
+        try:
+            while not self._closing.is_set():
+                await asyncio.sleep(self.health_interval)
+                if not self._closing.is_set() and not getattr(self._socket, "is_connected", True):
+                    self._lost("소켓 연결 끊김")
+                    break
+        finally:
+            await self._socket.close()
+
+    def _lost(self, reason):
+        """구독이 끊겼을 때 폴링으로 전환합니다."""
+        self.subscribed = False
+        if self._closing.is_set():
+            # stop()으로 닫은 경우
+            return
+        self._closing.set()
+        if self.fallback and not self._fallback_active:
+            logger.warning("Realtime 연결이 끊겨 폴링으로 전환합니다: %s", reason)
+            self.fallback.start(self._emit)
+            self._fallback_active = True
+        else:
+            logger.warning("Realtime 연결이 끊겼습니다: %s", reason)
+
+    def _on_change(self, payload: Dict[str, Any]):
+        data = payload.get("data", payload)
+        self._emit({
+            "table": data.get("table"),
+            "type": data.get("type") or data.get("eventType"),
+            "record": data.get("record") or data.get("new") or {},
+            "old_record": data.get("old_record") or data.get("old") or {},
+        })
+
+
+class TailPoller:
+    """
+    (updated_at, id) 커서 기준 변경분 폴링 소스 (Realtime 대체)
+
+    마지막으로 본 (updated_at, id) 이후의 행만 가져오므로 매 폴링 비용은 변경량에 비례하고,
+    한 트랜잭션에서 batch_size보다 많은 행이 같은 updated_at으로 바뀌어도 다음 폴링에서 이어집니다.
+    삭제는 updated_at으로 알 수 없으므로, track()으로 등록된 행이 아직 있는지
+    reconcile_every번째 폴링마다 ID로 확인합니다.
+
+    Args:
+        client: fetch_changes / fetch_existing_ids / get_latest_updated_at 를 제공하는 객체
+            (SupabaseClient 또는 LocalTables)
+    """
+
+    def __init__(
+        self,
+        client,
+        tables: Iterable[str] = TABLES,
+        interval: float = 5.0,
+        batch_size: int = 500,
+        reconcile_every: int = 6
+    ):
+        self.client = client
+        self.tables = list(tables)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.reconcile_every = reconcile_every
+        self._cursors: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        # 테이블 -> 구독자(LiveResultSet)별 삭제 감지 대상 ID
+        self._tracked: Dict[str, Dict[str, Set[str]]] = defaultdict(dict)
+        self._polls = 0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._emit = None
+
+    def prime(self):
+        """현재 시점으로 커서를 잡습니다. 이후 start()하면 이 시점부터의 변경분을 받습니다."""
+        for table in self.tables:
+            # 시작 시각의 행은 id 없이 포함해서 한 번 더 받음 (반영은 멱등)
+            self._cursors[table] = (self.client.get_latest_updated_at(table), None)
+
+    def start(self, emit: Callable[[Change], None]):
+        self._emit = emit
+        if not self._cursors:
+            self.prime()
+        self._stop.clear()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def track(self, table: str, owner: str, ids: Iterable[str]):
+        with self._lock:
+            self._tracked[table][owner] = set(ids)
+
+    def untrack(self, table: str, owner: str):
+        with self._lock:
+            self._tracked[table].pop(owner, None)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("변경 피드 폴링 오류")
+
+    def poll_once(self):
+        """모든 테이블의 새 변경분을 한 번 가져와 발행합니다."""
+        self._polls += 1
+        for table in self.tables:
+            self._poll_table(table)
+            if self._polls % self.reconcile_every == 0:
+                self._reconcile_deletes(table)
+
+    def _poll_table(self, table: str):
+        since, after_id = self._cursors.get(table, (None, None))
+        rows = self.client.fetch_changes(table, since, after_id, self.batch_size)
+        for row in rows:
+            updated_at = row.get("updated_at")
+            self._cursors[table] = (updated_at, row["id"])
+
+            change_type = "INSERT" if row.get("created_at") == updated_at else "UPDATE"
+            self._emit({"table": table, "type": change_type, "record": row, "old_record": {}})
+
+    def _reconcile_deletes(self, table: str):
+        with self._lock:
+            tracked = set().union(*self._tracked[table].values())
+        if not tracked:
+            return
+
+        existing = set(self.client.fetch_existing_ids(table, list(tracked)))
+        for row_id in tracked - existing:
+            with self._lock:
+                for ids in self._tracked[table].values():
+                    ids.discard(row_id)
+            self._emit({"table": table, "type": "DELETE", "record": {}, "old_record": {"id": row_id}})
+
+
+class LocalTables:
+    """
+    테스트용 로컬 대체 저장소
+
+    insert/update/delete 시 start()로 연결된 피드에 바로 이벤트를 발행하며(Realtime 대체),
+    TailPoller의 client로 넘기면 updated_at 폴링 경로도 그대로 검증할 수 있습니다.
+    """
+
+    def __init__(self, tables: Iterable[str] = TABLES):
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = {table: {} for table in tables}
+        self._emit = None
+        self._last_time = None
+        self._lock = threading.Lock()
+
+    # --- 변경 소스 ---
+    def start(self, emit: Callable[[Change], None]):
+        self._emit = emit
+
+    def stop(self):
+        self._emit = None
+
+    # --- 데이터 변경 ---
+    def insert(self, table: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            now = self._now()
+            row = {"id": str(uuid.uuid4()), "created_at": now, **record, "updated_at": now}
+            self.tables[table][row["id"]] = row
+        self._publish(table, "INSERT", row, {})
+        return row
+
+    def update(self, table: str, row_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            old = self.tables[table][row_id]
+            row = {**old, **data, "updated_at": self._now()}
+            self.tables[table][row_id] = row
+        self._publish(table, "UPDATE", row, old)
+        return row
+
+    def delete(self, table: str, row_id: str):
+        with self._lock:
+            old = self.tables[table].pop(row_id)
+        self._publish(table, "DELETE", {}, {"id": old["id"]})
+
+    # --- TailPoller용 조회 (SupabaseClient와 같은 시그니처) ---
+    def get_latest_updated_at(self, table: str) -> Optional[str]:
+        with self._lock:
+            times = [row["updated_at"] for row in self.tables[table].values()]
+        return max(times) if times else None
+
+    def fetch_changes(
+        self,
+        table: str,
+        since: Optional[str],
+        after_id: Optional[str] = None,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        cursor = (since, after_id or "")
+        with self._lock:
+            rows = [
+                row for row in self.tables[table].values()
+                if since is None or (row["updated_at"], row["id"]) > cursor
+            ]
+        return sorted(rows, key=lambda row: (row["updated_at"], row["id"]))[:limit]
+
+    def fetch_existing_ids(self, table: str, ids: List[str]) -> List[str]:
+        with self._lock:
+            return [row_id for row_id in ids if row_id in self.tables[table]]
+
+    def _now(self) -> str:
+        # 같은 마이크로초에 여러 번 변경되어도 순서가 유지되도록 단조 증가
+        now = datetime.now(timezone.utc)
+        if self._last_time and now <= self._last_time:
+            now = self._last_time + timedelta(microseconds=1)
+        self._last_time = now
+        return now.isoformat()
+
+    def _publish(self, table: str, change_type: str, record: Dict[str, Any], old_record: Dict[str, Any]):
+        if self._emit:
+            self._emit({"table": table, "type": change_type, "record": record, "old_record": old_record})
+
+
+def create_change_feed(
+    client,
+    tables: Iterable[str] = TABLES,
+    poll_interval: float = 5.0,
+    prefer_realtime: bool = True
+) -> ChangeFeed:
+    """
+    SupabaseClient용 변경 피드를 만들어 시작합니다.
+
+    Realtime 연결에 실패하면 (패키지 없음, 테이블이 publication에 없음 등)
+    updated_at 폴링으로 대체하고, 연결된 뒤에 끊겨도 폴링으로 전환합니다.
+    """
+    poller = TailPoller(client, tables, interval=poll_interval)
+    if prefer_realtime:
+        try:
+            return ChangeFeed(RealtimeSource(client.url, client.key, tables, fallback=poller)).start()
+        except Exception as e:
+            logger.warning("Realtime 사용 불가, 폴링으로 대체합니다: %s", e)
+
+    return ChangeFeed(poller).start()
@@ -0,0 +1,194 @@
+"""
+쿼리 플랜 검사
+
+supabase_client.py가 보내는 쿼리 형태마다 EXPLAIN을 실행해
+대량 시드 데이터에서 Sequential Scan으로 떨어지는 형태가 있으면 실패합니다.
+
+로컬 Postgres에 임시 스키마를 만들어 마이그레이션을 적용한 뒤 검사하고,
+끝나면 스키마를 삭제하므로 기존 데이터에는 영향을 주지 않습니다.
+
+사용법:
+    python check_query_plans.py --database-url postgresql://postgres@localhost/postgres
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from migrate import apply_migrations, get_database_url
+
+SCRATCH_SCHEMA = "query_plan_check"
+
+TRADE_ROWS = 200_000
+DAILY_NOTE_DAYS = 20_000
+
+# PostgREST가 supabase_client.py의 호출을 변환한 SQL과 같은 형태
+# (테스트 연결용 `select id limit 1`은 LIMIT 1이라 제외)
+QUERY_SHAPES = {
+    "query_trades (기본)": """
+        SELECT * FROM trades
+        ORDER BY trade_date DESC LIMIT 100
+    """,
+    "query_trades (검색)": """
+        SELECT * FROM trades
+        WHERE ticker ILIKE '%TSLA%' OR stock_name ILIKE '%TSLA%'
+        ORDER BY trade_date DESC LIMIT 100
+    """,
+    "query_trades (드문 검색어)": """
+        SELECT * FROM trades
+        WHERE ticker ILIKE '%RARE%' OR stock_name ILIKE '%RARE%'
+        ORDER BY trade_date DESC LIMIT 100
+    """,
+    "query_trades (티커별)": """
+        SELECT * FROM trades
+        WHERE ticker = 'TSLA'
+        ORDER BY trade_date DESC LIMIT 5
+    """,
+    "update/delete_trade": """
+        SELECT * FROM trades WHERE id = '00000000-0000-0000-0000-000000000000'
+    """,
+    "get_daily_note_by_date": """
+        SELECT * FROM daily_notes WHERE note_date = '2024-01-02'
+    """,
+    "query_daily_notes (기본)": """
+        SELECT * FROM daily_notes ORDER BY note_date DESC LIMIT 30
+    """,
+    "query_daily_notes (태그)": """
+        SELECT * FROM daily_notes
+        WHERE tags @> ARRAY['#rare']
+        ORDER BY note_date DESC LIMIT 30
+    """,
+    "query_daily_notes (기간)": """
+        SELECT * FROM daily_notes
+        WHERE note_date >= '2020-01-01' AND note_date <= '2020-01-31'
+        ORDER BY note_date DESC LIMIT 30
+    """,
+    "update/delete_daily_note": """
+        SELECT * FROM daily_notes WHERE id = '00000000-0000-0000-0000-000000000000'
+    """,
+    "fetch_changes (trades)": """
+        SELECT * FROM trades
+        WHERE updated_at >= NOW() - INTERVAL '1 minute'
+          AND (updated_at > NOW() - INTERVAL '1 minute' OR id > '00000000-0000-0000-0000-000000000000')
+        ORDER BY updated_at, id LIMIT 500
+    """,
+    "fetch_changes (daily_notes)": """
+        SELECT * FROM daily_notes
+        WHERE updated_at >= NOW() - INTERVAL '1 minute'
+          AND (updated_at > NOW() - INTERVAL '1 minute' OR id > '00000000-0000-0000-0000-000000000000')
+        ORDER BY updated_at, id LIMIT 500
+    """,
+    "get_latest_updated_at (trades)": """
+        SELECT updated_at FROM trades ORDER BY updated_at DESC LIMIT 1
+    """,
+    "fetch_existing_ids (trades)": """
+        SELECT id FROM trades
+        WHERE id IN ('00000000-0000-0000-0000-000000000000', '00000000-0000-0000-0000-000000000001')
+    """,
+}
+
+
+def seed(conn):
+    """
+    검사용 대량 데이터를 생성합니다.
+
+    updated_at은 UPDATE로 채우면 set_updated_at 트리거가 NOW()로 덮어쓰므로
+    INSERT 시점에 행마다 다른 값으로 넣습니다.
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            INSERT INTO trades (stock_name, ticker, trade_date, trade_type, price, quantity, reason, updated_at)
+            SELECT
+                CASE WHEN i % 5000 = 0 THEN 'Rare Corp' ELSE '종목' || (i % 500) END,
+                CASE WHEN i % 5000 = 0 THEN 'RARE'
+                     WHEN i % 50 = 0 THEN 'TSLA'
+                     ELSE 'T' || lpad((i % 500)::text, 4, '0') || '.KS' END,
+                NOW() - (i || ' minutes')::interval,
+                CASE WHEN i % 2 = 0 THEN '매수' ELSE '매도' END,
+                1000 + i % 100,
+                1 + i % 10,
+                repeat('근거 ', 10),
+                NOW() - (i || ' minutes')::interval
+            FROM generate_series(1, {TRADE_ROWS}) AS i
+        """)
+        cur.execute(f"""
+            INSERT INTO daily_notes (note_date, content, tags, updated_at)
+            SELECT
+                DATE '1970-01-01' + i,
+                repeat('메모 ', 20),
+                CASE WHEN i % 1000 = 0 THEN ARRAY['#rare'] ELSE ARRAY['#반도체', '#종가베팅'] END,
+                (DATE '1970-01-01' + i)::timestamptz
+            FROM generate_series(1, {DAILY_NOTE_DAYS}) AS i
+        """)
+        cur.execute("ANALYZE trades")
+        cur.execute("ANALYZE daily_notes")
+    conn.commit()
+
+
+def find_seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """플랜 트리에서 Seq Scan 노드의 대상 테이블을 모읍니다."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+def explain(conn, sql: str) -> Dict[str, Any]:
+    """EXPLAIN (FORMAT JSON) 결과의 최상위 플랜 노드를 반환합니다."""
+    with conn.cursor() as cur:
+        cur.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        result = cur.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def check(conn) -> List[str]:
+    """모든 쿼리 형태를 검사하고 실패 메시지 목록을 반환합니다."""
+    failures = []
+    for name, sql in QUERY_SHAPES.items():
+        seq_scans = find_seq_scans(explain(conn, sql))
+        if seq_scans:
+            failures.append(f"{name}: Seq Scan on {', '.join(seq_scans)}")
+            print(f"❌ {name}")
+        else:
+            print(f"✅ {name}")
+    return failures
+
+
+def main():
+    import psycopg2
+
+    parser = argparse.ArgumentParser(description="쿼리 형태별 EXPLAIN 검사")
+    parser.add_argument("--database-url", help="로컬 Postgres 연결 문자열 (기본: DATABASE_URL)")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.database_url or get_database_url())
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+            cur.execute(f"CREATE SCHEMA {SCRATCH_SCHEMA}")
+            cur.execute(f"SET search_path TO {SCRATCH_SCHEMA}, public")
+        conn.commit()
+
+        apply_migrations(conn, verbose=False)
+        seed(conn)
+        failures = check(conn)
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        return 1
+    print("모든 쿼리 형태가 인덱스를 사용합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
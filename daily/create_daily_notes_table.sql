@@ -1,5 +1,6 @@
 -- Daily Notes 테이블 생성 스크립트
--- Supabase SQL Editor에서 실행하세요
+-- Supabase SQL Editor에서 실행하세요 (수동 설정용)
+-- 권장: 프로젝트 루트에서 `python migrate.py` 로 migrations/ 를 버전 관리하며 적용
 
 CREATE TABLE IF NOT EXISTS daily_notes (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
@@ -7,9 +8,43 @@ CREATE TABLE IF NOT EXISTS daily_notes (
     note_date DATE NOT NULL DEFAULT CURRENT_DATE,
     content TEXT,                    -- 짧은 메모
     tags TEXT[] DEFAULT '{}',        -- 해시태그 배열
-    image_urls TEXT[] DEFAULT '{}'   -- 이미지 URL 배열 (여러 장)
+    image_urls TEXT[] DEFAULT '{}',  -- 이미지 URL 배열 (여러 장)
+    revision INTEGER NOT NULL DEFAULT 0,  -- 저장 버전 (낙관적 동시성 제어)
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()  -- 마지막 수정 시각 (변경 피드)
 );
 
+-- 이전 버전으로 만든 테이블에도 revision / updated_at 추가 (재실행 가능)
+ALTER TABLE daily_notes ADD COLUMN IF NOT EXISTS revision INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE daily_notes ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+-- 수정할 때마다 revision 자동 증가 (모든 클라이언트 공통)
+CREATE OR REPLACE FUNCTION bump_daily_note_revision()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.revision = OLD.revision + 1;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS daily_notes_bump_revision ON daily_notes;
+CREATE TRIGGER daily_notes_bump_revision
+    BEFORE UPDATE ON daily_notes
+    FOR EACH ROW EXECUTE FUNCTION bump_daily_note_revision();
+
+-- 수정 시 updated_at 자동 갱신 (변경 피드 폴링 기준)
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS daily_notes_set_updated_at ON daily_notes;
+CREATE TRIGGER daily_notes_set_updated_at
+    BEFORE UPDATE ON daily_notes
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
 -- 기존 중복 데이터 정리 (같은 날짜는 최신 1건만 유지)
 WITH ranked AS (
     SELECT
@@ -45,6 +80,19 @@ CREATE INDEX IF NOT EXISTS idx_daily_notes_date ON daily_notes(note_date DESC);
 -- tags에 GIN 인덱스 추가 (태그 검색 성능 향상)
 CREATE INDEX IF NOT EXISTS idx_daily_notes_tags ON daily_notes USING GIN(tags);
 
+-- updated_at 폴링용 인덱스
+CREATE INDEX IF NOT EXISTS idx_daily_notes_updated_at ON daily_notes(updated_at, id);
+
+-- 다른 기기 변경 사항 실시간 반영 (Supabase Realtime)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime')
+       AND NOT EXISTS (SELECT 1 FROM pg_publication_tables
+                       WHERE pubname = 'supabase_realtime' AND tablename = 'daily_notes') THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE daily_notes;
+    END IF;
+END $$;
+
 -- RLS (Row Level Security) 정책 설정 (선택사항)
 -- 필요한 경우 아래 주석을 해제하세요
 
@@ -66,3 +114,5 @@ COMMENT ON COLUMN daily_notes.note_date IS '노트 날짜';
 COMMENT ON COLUMN daily_notes.content IS '메모 내용';
 COMMENT ON COLUMN daily_notes.tags IS '해시태그 배열 (예: {#반도체, #종가베팅})';
 COMMENT ON COLUMN daily_notes.image_urls IS '첨부 이미지 URL 배열';
+COMMENT ON COLUMN daily_notes.revision IS '저장 버전 (낙관적 동시성 제어)';
+COMMENT ON COLUMN daily_notes.updated_at IS '마지막 수정 시각 (변경 피드 폴링 기준)';
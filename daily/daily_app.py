@@ -7,10 +7,15 @@ from pathlib import Path
 # 상위 디렉토리의 supabase_client 사용
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from datetime import datetime, date
 from supabase_client import SupabaseClient
+from change_feed import LiveResultSet, create_change_feed
+from note_patch import InvalidChanges, NoteConflict, save_note_changes
+import json
 import os
+import queue
+import threading
 
 app = Flask(__name__)
 
@@ -45,6 +50,33 @@ def get_client():
         _client = get_supabase_client()
     return _client
 
+# daily_notes 변경 피드와 최근 노트 목록 캐시 (lazy initialization)
+RECENT_NOTES_LIMIT = 30
+_feed = None
+_recent_notes = None
+_feed_lock = threading.Lock()
+
+def get_feed():
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = create_change_feed(get_client(), tables=("daily_notes",))
+    return _feed
+
+def get_recent_notes(limit):
+    """최근 노트 목록을 변경 피드로 갱신되는 캐시에서 반환"""
+    global _recent_notes
+    with _feed_lock:
+        if _recent_notes is None:
+            _recent_notes = LiveResultSet("daily_notes", sort_key="note_date", limit=RECENT_NOTES_LIMIT)
+    # 구독을 먼저 해야 조회와 구독 사이의 변경도 놓치지 않고,
+    # 구독에 실패하면 load 전이므로 다음 요청에서 다시 시도함
+    if not _recent_notes.bound:
+        _recent_notes.bind(get_feed())
+    if _recent_notes.version == 0 or _recent_notes.needs_reload or not _recent_notes.connected:
+        _recent_notes.load(get_client().query_daily_notes(limit=RECENT_NOTES_LIMIT))
+    return _recent_notes.rows()[:limit]
+
 
 @app.route("/")
 def index():
@@ -68,38 +100,24 @@ def get_note(note_date):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@app.route("/api/note", methods=["POST"])
-def save_note():
-    """노트 저장 (생성 또는 업데이트)"""
-    try:
-        data = request.json
-        client = get_client()
+@app.route("/api/note/<note_date>", methods=["PATCH"])
+def patch_note(note_date):
+    """
+    노트 변경분 저장 (낙관적 동시성 제어)
 
-        note_date = data.get("note_date")
-        content = data.get("content", "")
-        tags = data.get("tags", [])
-        image_urls = data.get("image_urls", [])
-
-        # 기존 노트가 있는지 확인
-        existing = client.get_daily_note_by_date(note_date)
-
-        if existing:
-            # 업데이트
-            result = client.update_daily_note(existing["id"], {
-                "content": content,
-                "tags": tags,
-                "image_urls": image_urls
-            })
-        else:
-            # 새로 생성
-            result = client.create_daily_note({
-                "note_date": note_date,
-                "content": content,
-                "tags": tags,
-                "image_urls": image_urls
-            })
-
-        return jsonify({"success": True, "note": result})
+    base_revision과 변경된 필드만 받아 현재 노트에 적용합니다.
+    revision이 달라도 변경분이 깔끔하게 적용되면 병합하고,
+    그렇지 않으면 409와 함께 최신 노트를 반환합니다.
+    """
+    try:
+        changes = request.get_json(silent=True)
+        note = save_note_changes(get_client(), note_date, changes)
+
+        return jsonify({"success": True, "note": note})
+    except NoteConflict as e:
+        return jsonify({"success": False, "conflict": True, "error": str(e), "note": e.note}), 409
+    except InvalidChanges as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -136,13 +154,47 @@ def list_notes():
         tag = request.args.get("tag")
         limit = int(request.args.get("limit", 30))
 
-        notes = client.query_daily_notes(search_tag=tag, limit=limit)
+        notes = None
+        if not tag and limit <= RECENT_NOTES_LIMIT:
+            try:
+                notes = get_recent_notes(limit)
+            except Exception:
+                notes = None
+
+        if notes is None:
+            notes = client.query_daily_notes(search_tag=tag, limit=limit)
 
         return jsonify({"success": True, "notes": notes})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route("/api/changes", methods=["GET"])
+def stream_changes():
+    """daily_notes 변경 사항을 Server-Sent Events로 전달"""
+    try:
+        feed = get_feed()
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 503
+
+    events = queue.Queue()
+    unsubscribe = feed.subscribe("daily_notes", events.put)
+
+    def generate():
+        try:
+            while True:
+                try:
+                    change = events.get(timeout=15)
+                    yield f"data: {json.dumps(change, ensure_ascii=False, default=str)}\n\n"
+                except queue.Empty:
+                    # 연결 유지용 주석 이벤트
+                    yield ": keepalive\n\n"
+        finally:
+            unsubscribe()
+
+    return Response(generate(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 if __name__ == "__main__":
     print("=" * 50)
     print("Daily Notes Server Starting...")
@@ -0,0 +1,155 @@
+"""
+스키마 마이그레이션 실행기
+
+migrations/ 폴더의 `NNN_설명.sql` 파일을 버전 순서대로 적용하고,
+적용된 버전을 schema_migrations 테이블에 기록합니다.
+
+사용법:
+    python migrate.py            # 미적용 마이그레이션 적용
+    python migrate.py --status   # 적용 현황 출력
+
+DATABASE_URL은 .env 또는 환경변수에서 읽습니다.
+(Supabase Dashboard > Settings > Database > Connection string)
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List, Set, Tuple
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+CREATE_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+)
+"""
+
+
+def load_env_file() -> dict:
+    """프로젝트 루트의 .env 파일 내용을 딕셔너리로 로드"""
+    env_path = Path(__file__).parent / ".env"
+    env_vars = {}
+    if env_path.exists():
+        with open(env_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    env_vars[key.strip()] = value.strip()
+    return env_vars
+
+
+def get_database_url() -> str:
+    """.env 또는 환경변수에서 DATABASE_URL 반환"""
+    url = load_env_file().get("DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise Exception("DATABASE_URL을 설정해주세요.")
+    return url
+
+
+def load_migrations(migrations_dir: Path = MIGRATIONS_DIR) -> List[Tuple[str, Path]]:
+    """
+    마이그레이션 파일 목록을 (버전, 경로) 튜플로 반환합니다.
+
+    파일명 앞의 숫자 부분이 버전이며, 버전 순으로 정렬됩니다.
+    """
+    migrations = []
+    for path in migrations_dir.glob("*.sql"):
+        version = path.stem.split("_", 1)[0]
+        if not version.isdigit():
+            raise Exception(f"잘못된 마이그레이션 파일명: {path.name}")
+        migrations.append((version, path))
+
+    # 001과 1처럼 표기만 다른 같은 버전도 중복으로 처리
+    versions = [int(v) for v, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise Exception("중복된 마이그레이션 버전이 있습니다.")
+
+    return sorted(migrations, key=lambda m: int(m[0]))
+
+
+def applied_versions(conn) -> Set[str]:
+    """이미 적용된 마이그레이션 버전 집합을 반환합니다."""
+    with conn.cursor() as cur:
+        cur.execute(CREATE_VERSION_TABLE)
+        cur.execute("SELECT version FROM schema_migrations")
+        versions = {row[0] for row in cur.fetchall()}
+    conn.commit()
+    return versions
+
+
+def apply_migrations(conn, migrations_dir: Path = MIGRATIONS_DIR, verbose: bool = True) -> List[str]:
+    """
+    미적용 마이그레이션을 순서대로 적용합니다.
+
+    각 마이그레이션은 버전 기록과 함께 하나의 트랜잭션으로 실행되며,
+    실패 시 해당 마이그레이션은 롤백되고 이후 버전은 적용되지 않습니다.
+
+    Returns:
+        이번에 적용된 버전 목록
+    """
+    done = applied_versions(conn)
+    applied = []
+
+    for version, path in load_migrations(migrations_dir):
+        if version in done:
+            continue
+
+        sql = path.read_text(encoding="utf-8")
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (version, path.name),
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"마이그레이션 실패 ({path.name}): {e}")
+
+        applied.append(version)
+        if verbose:
+            print(f"적용 완료: {path.name}")
+
+    return applied
+
+
+def print_status(conn, migrations_dir: Path = MIGRATIONS_DIR):
+    """마이그레이션별 적용 여부를 출력합니다."""
+    done = applied_versions(conn)
+    for version, path in load_migrations(migrations_dir):
+        mark = "✅" if version in done else "⏳"
+        print(f"{mark} {path.name}")
+
+
+def main():
+    import psycopg2
+
+    parser = argparse.ArgumentParser(description="Supabase/Postgres 스키마 마이그레이션")
+    parser.add_argument("--database-url", help="Postgres 연결 문자열 (기본: DATABASE_URL)")
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.database_url or get_database_url())
+    try:
+        if args.status:
+            print_status(conn)
+            return 0
+
+        applied = apply_migrations(conn)
+        if not applied:
+            print("적용할 마이그레이션이 없습니다.")
+        return 0
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
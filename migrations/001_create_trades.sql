@@ -0,0 +1,72 @@
+-- 001: trades 테이블 생성 (schema.sql 기준)
+
+CREATE TABLE IF NOT EXISTS trades (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    -- 기본 정보
+    stock_name TEXT NOT NULL,           -- 종목명
+    ticker TEXT NOT NULL,               -- 티커 (예: 005930.KS, TSLA)
+    trade_date TIMESTAMP WITH TIME ZONE NOT NULL,  -- 매매일자
+    trade_type TEXT NOT NULL,           -- 구분 (매수/매도/일일요약)
+
+    -- 거래 정보
+    price NUMERIC DEFAULT 0,            -- 단가
+    quantity NUMERIC DEFAULT 0,         -- 수량
+
+    -- 메타 정보
+    mood TEXT,                          -- 나의 기분
+    reason TEXT,                        -- 매매 근거
+    themes TEXT[] DEFAULT '{}',         -- 테마/이슈 (배열)
+    image_url TEXT                      -- 이미지 URL
+);
+
+CREATE INDEX IF NOT EXISTS idx_trades_ticker ON trades(ticker);
+CREATE INDEX IF NOT EXISTS idx_trades_trade_date ON trades(trade_date DESC);
+CREATE INDEX IF NOT EXISTS idx_trades_stock_name ON trades(stock_name);
+
+COMMENT ON TABLE trades IS '주식 매매 일지 테이블';
+COMMENT ON COLUMN trades.ticker IS 'DAILY_NOTE는 일일 요약을 의미함';
+
+-- Storage 버킷/정책은 Supabase에서만 존재하므로 storage 스키마가 있을 때만 적용
+-- (로컬 Postgres에서 쿼리 플랜 검사 시에는 건너뜀)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.tables
+               WHERE table_schema = 'storage' AND table_name = 'buckets') THEN
+        INSERT INTO storage.buckets (id, name, public)
+        VALUES ('trade-images', 'trade-images', true)
+        ON CONFLICT (id) DO NOTHING;
+
+        DROP POLICY IF EXISTS "Public read access" ON storage.objects;
+        DROP POLICY IF EXISTS "Authenticated upload access" ON storage.objects;
+        DROP POLICY IF EXISTS "Authenticated delete access" ON storage.objects;
+        DROP POLICY IF EXISTS "Anon upload access" ON storage.objects;
+        DROP POLICY IF EXISTS "Anon delete access" ON storage.objects;
+
+        CREATE POLICY "Public read access"
+        ON storage.objects FOR SELECT
+        TO public
+        USING (bucket_id = 'trade-images');
+
+        CREATE POLICY "Anon upload access"
+        ON storage.objects FOR INSERT
+        TO anon
+        WITH CHECK (bucket_id = 'trade-images');
+
+        CREATE POLICY "Anon delete access"
+        ON storage.objects FOR DELETE
+        TO anon
+        USING (bucket_id = 'trade-images');
+
+        CREATE POLICY "Authenticated upload access"
+        ON storage.objects FOR INSERT
+        TO authenticated
+        WITH CHECK (bucket_id = 'trade-images');
+
+        CREATE POLICY "Authenticated delete access"
+        ON storage.objects FOR DELETE
+        TO authenticated
+        USING (bucket_id = 'trade-images');
+    END IF;
+END $$;
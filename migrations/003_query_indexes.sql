@@ -0,0 +1,29 @@
+-- 003: 클라이언트 쿼리 형태에 맞춘 인덱스
+-- query_trades: ticker <> 'DAILY_NOTE' + (ticker/stock_name ilike) + ORDER BY trade_date DESC LIMIT
+-- query_daily_notes: (tags @> / note_date 범위) + ORDER BY note_date DESC LIMIT
+
+-- ilike '%키워드%' 검색용 trigram 확장
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 티커별 최근 매매 조회(query_trades(ticker=...), 기록 탭)용 복합 인덱스 (ticker 단일 인덱스를 대체)
+CREATE INDEX IF NOT EXISTS idx_trades_ticker_trade_date ON trades(ticker, trade_date DESC);
+DROP INDEX IF EXISTS idx_trades_ticker;
+
+-- 일일 요약(DAILY_NOTE)을 제외한 최근 매매 목록용 부분 인덱스
+-- (query_trades는 select *라 index-only scan이 불가능하므로 INCLUDE 컬럼은 두지 않음)
+CREATE INDEX IF NOT EXISTS idx_trades_executions_date
+    ON trades(trade_date DESC)
+    WHERE ticker <> 'DAILY_NOTE';
+
+-- 티커/종목명 ilike 검색용 부분 trigram 인덱스 (stock_name btree 인덱스를 대체)
+CREATE INDEX IF NOT EXISTS idx_trades_ticker_trgm
+    ON trades USING GIN (ticker gin_trgm_ops)
+    WHERE ticker <> 'DAILY_NOTE';
+CREATE INDEX IF NOT EXISTS idx_trades_stock_name_trgm
+    ON trades USING GIN (stock_name gin_trgm_ops)
+    WHERE ticker <> 'DAILY_NOTE';
+DROP INDEX IF EXISTS idx_trades_stock_name;
+
+-- 날짜별 노트 조회는 daily_notes_note_date_key(UNIQUE)가 담당하므로 중복 인덱스 제거
+-- 최신순 목록/기간 조회도 같은 btree를 역방향으로 스캔
+DROP INDEX IF EXISTS idx_daily_notes_date;
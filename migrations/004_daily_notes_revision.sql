@@ -0,0 +1,20 @@
+-- 004: daily_notes 낙관적 동시성 제어용 revision 컬럼
+-- 저장할 때마다 1씩 증가하며, 클라이언트는 기준 revision과 함께 변경분만 전송
+
+ALTER TABLE daily_notes ADD COLUMN IF NOT EXISTS revision INTEGER NOT NULL DEFAULT 0;
+
+-- 어떤 클라이언트가 수정하든(웹/Flask/SQL Editor) revision이 올라가도록 트리거로 증가
+CREATE OR REPLACE FUNCTION bump_daily_note_revision()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.revision = OLD.revision + 1;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS daily_notes_bump_revision ON daily_notes;
+CREATE TRIGGER daily_notes_bump_revision
+    BEFORE UPDATE ON daily_notes
+    FOR EACH ROW EXECUTE FUNCTION bump_daily_note_revision();
+
+COMMENT ON COLUMN daily_notes.revision IS '저장 버전 (낙관적 동시성 제어)';
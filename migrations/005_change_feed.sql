@@ -0,0 +1,49 @@
+-- 005: 변경 피드용 updated_at 컬럼 / 트리거 / Realtime publication
+
+ALTER TABLE trades ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+ALTER TABLE daily_notes ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+-- 기존 행은 생성 시각으로 채움
+UPDATE trades SET updated_at = created_at WHERE created_at IS NOT NULL;
+UPDATE daily_notes SET updated_at = created_at WHERE created_at IS NOT NULL;
+
+-- 수정 시 updated_at 자동 갱신
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trades_set_updated_at ON trades;
+CREATE TRIGGER trades_set_updated_at
+    BEFORE UPDATE ON trades
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS daily_notes_set_updated_at ON daily_notes;
+CREATE TRIGGER daily_notes_set_updated_at
+    BEFORE UPDATE ON daily_notes
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- 폴링((updated_at, id) > 커서 ORDER BY updated_at, id)용 인덱스
+CREATE INDEX IF NOT EXISTS idx_trades_updated_at ON trades(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_daily_notes_updated_at ON daily_notes(updated_at, id);
+
+-- Supabase Realtime 구독 대상에 추가 (publication이 있는 환경에서만)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        IF NOT EXISTS (SELECT 1 FROM pg_publication_tables
+                       WHERE pubname = 'supabase_realtime' AND tablename = 'trades') THEN
+            ALTER PUBLICATION supabase_realtime ADD TABLE trades;
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_publication_tables
+                       WHERE pubname = 'supabase_realtime' AND tablename = 'daily_notes') THEN
+            ALTER PUBLICATION supabase_realtime ADD TABLE daily_notes;
+        END IF;
+    END IF;
+END $$;
+
+COMMENT ON COLUMN trades.updated_at IS '마지막 수정 시각 (변경 피드 폴링 기준)';
+COMMENT ON COLUMN daily_notes.updated_at IS '마지막 수정 시각 (변경 피드 폴링 기준)';
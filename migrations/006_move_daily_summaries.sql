@@ -0,0 +1,77 @@
+-- 006: trades의 일일 요약(ticker = 'DAILY_NOTE') 행을 daily_notes로 이동
+-- 같은 날짜의 요약은 작성 순으로 합치고, 기존 노트가 있으면 내용 뒤에 덧붙이며 태그는 합집합
+-- 이후 trades에는 실제 매매 기록만 남음
+
+WITH summary_rows AS (
+    SELECT
+        (trade_date AT TIME ZONE 'UTC')::date AS note_date,
+        created_at,
+        reason,
+        themes
+    FROM trades
+    WHERE ticker = 'DAILY_NOTE'
+),
+summary_tags AS (
+    SELECT
+        r.note_date,
+        array_agg(DISTINCT CASE WHEN btrim(theme) LIKE '#%' THEN btrim(theme) ELSE '#' || btrim(theme) END) AS tags
+    FROM summary_rows r, unnest(r.themes) AS theme
+    WHERE btrim(theme) <> ''
+    GROUP BY r.note_date
+),
+summaries AS (
+    SELECT
+        r.note_date,
+        COALESCE(
+            string_agg(r.reason, E'\n\n' ORDER BY r.created_at) FILTER (WHERE COALESCE(r.reason, '') <> ''),
+            ''
+        ) AS content,
+        COALESCE(t.tags, '{}') AS tags
+    FROM summary_rows r
+    LEFT JOIN summary_tags t USING (note_date)
+    GROUP BY r.note_date, t.tags
+)
+INSERT INTO daily_notes (note_date, content, tags, revision)
+SELECT note_date, content, tags, 1
+FROM summaries
+ON CONFLICT (note_date) DO UPDATE SET
+    content = CASE
+        WHEN COALESCE(daily_notes.content, '') = '' THEN EXCLUDED.content
+        WHEN EXCLUDED.content = '' OR position(EXCLUDED.content IN daily_notes.content) > 0 THEN daily_notes.content
+        ELSE daily_notes.content || E'\n\n' || EXCLUDED.content
+    END,
+    tags = ARRAY(
+        SELECT tag
+        FROM unnest(COALESCE(daily_notes.tags, '{}') || EXCLUDED.tags) WITH ORDINALITY AS u(tag, n)
+        GROUP BY tag
+        ORDER BY min(n)
+    ),
+    revision = daily_notes.revision + 1;
+
+DELETE FROM trades WHERE ticker = 'DAILY_NOTE';
+
+-- 일일 요약이 다시 trades에 들어오지 않도록 제약 추가
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint
+        WHERE conname = 'trades_ticker_not_daily_note'
+          AND conrelid = 'trades'::regclass
+    ) THEN
+        ALTER TABLE trades
+        ADD CONSTRAINT trades_ticker_not_daily_note CHECK (ticker <> 'DAILY_NOTE');
+    END IF;
+END $$;
+
+-- DAILY_NOTE 제외 조건이 필요 없어졌으므로 부분 인덱스를 일반 인덱스로 교체
+DROP INDEX IF EXISTS idx_trades_executions_date;
+DROP INDEX IF EXISTS idx_trades_ticker_trgm;
+DROP INDEX IF EXISTS idx_trades_stock_name_trgm;
+
+-- 최근 매매 목록은 001의 idx_trades_trade_date(trade_date DESC)가 담당
+CREATE INDEX IF NOT EXISTS idx_trades_ticker_trgm ON trades USING GIN (ticker gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_trades_stock_name_trgm ON trades USING GIN (stock_name gin_trgm_ops);
+
+COMMENT ON COLUMN trades.ticker IS '티커 (일일 요약은 daily_notes에 저장)';
+COMMENT ON COLUMN trades.trade_type IS '구분 (매수/매도)';
@@ -0,0 +1,234 @@
+"""
+일일 노트 변경분(diff) 적용 유틸리티
+
+클라이언트는 노트 전체 대신 변경분만 보냅니다.
+    - content_patch: 텍스트 패치 목록 [{"pos", "before", "delete", "insert"}, ...]
+      (pos는 코드 포인트 단위 - 브라우저도 UTF-16이 아닌 코드 포인트로 계산)
+    - content: 전체 내용 교체 (패치를 만들 수 없을 때만 사용)
+    - tags / image_urls: {"add": [...], "remove": [...]}
+
+revision이 일치하지 않아도 패치가 현재 내용에 깔끔하게 적용되면 병합하고,
+적용할 수 없으면 NoteConflict를 발생시킵니다.
+
+Flask 서버(daily/daily_app.py)와 Streamlit 일일 루틴 탭(app.py)이 함께 사용합니다.
+"""
+from typing import Any, Dict, List, Optional
+
+# 패치 위치를 다시 찾을 때 사용하는 앞쪽 문맥 길이
+CONTEXT_LENGTH = 16
+
+# 동시 저장으로 revision 비교가 실패했을 때 다시 시도하는 횟수
+MAX_SAVE_ATTEMPTS = 3
+
+# Postgres unique_violation 오류 코드 (같은 날짜 노트 동시 생성)
+UNIQUE_VIOLATION = "23505"
+
+
+class InvalidChanges(ValueError):
+    """변경분 형식이 잘못되었을 때 발생합니다."""
+
+
+class NoteConflict(Exception):
+    """변경분을 현재 노트에 병합할 수 없을 때 발생합니다. note에 최신 노트를 담습니다."""
+
+    def __init__(self, message: str, note: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.note = note
+
+
+def make_text_patch(old: str, new: str) -> Optional[Dict[str, Any]]:
+    """
+    old → new 변경을 하나의 치환 패치로 만듭니다. 변경이 없으면 None.
+
+    공통 접두사/접미사를 제외한 가운데 부분만 담으므로
+    긴 노트도 수정한 부분의 크기만큼만 전송됩니다.
+    """
+    if old == new:
+        return None
+
+    prefix = 0
+    max_prefix = min(len(old), len(new))
+    while prefix < max_prefix and old[prefix] == new[prefix]:
+        prefix += 1
+
+    suffix = 0
+    max_suffix = min(len(old), len(new)) - prefix
+    while suffix < max_suffix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+
+    return {
+        "pos": prefix,
+        "before": old[max(0, prefix - CONTEXT_LENGTH):prefix],
+        "delete": old[prefix:len(old) - suffix],
+        "insert": new[prefix:len(new) - suffix],
+    }
+
+
+def apply_text_patch(text: str, patch: Dict[str, Any]) -> str:
+    """
+    텍스트 패치를 적용합니다.
+
+    지정 위치의 문맥(before + delete)이 일치하면 그 위치에 적용하고,
+    다른 편집으로 위치가 밀렸다면 문맥이 유일하게 일치하는 곳을 찾아 적용합니다.
+    """
+    pos = int(patch.get("pos", 0))
+    before = patch.get("before", "")
+    delete = patch.get("delete", "")
+    insert = patch.get("insert", "")
+
+    if text[max(0, pos - len(before)):pos] == before and text[pos:pos + len(delete)] == delete:
+        return text[:pos] + insert + text[pos + len(delete):]
+
+    anchor = before + delete
+    if not anchor:
+        raise NoteConflict("패치 위치를 찾을 수 없습니다.")
+
+    found = text.find(anchor)
+    if found == -1 or text.find(anchor, found + 1) != -1:
+        raise NoteConflict("다른 기기에서 같은 부분이 수정되었습니다.")
+
+    start = found + len(before)
+    return text[:start] + insert + text[start + len(delete):]
+
+
+def apply_list_changes(items: List[str], changes: Dict[str, List[str]]) -> List[str]:
+    """순서를 유지하며 add/remove 변경을 적용합니다."""
+    removed = set(changes.get("remove", []))
+    result = [item for item in items if item not in removed]
+    for item in changes.get("add", []):
+        if item not in result:
+            result.append(item)
+    return result
+
+
+def _is_str_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def validate_changes(changes: Any):
+    """
+    클라이언트가 보낸 변경분의 형식을 검사합니다.
+
+    Raises:
+        InvalidChanges: 필드 타입이 맞지 않을 때
+    """
+    if not isinstance(changes, dict):
+        raise InvalidChanges("변경분은 객체여야 합니다.")
+
+    revision = changes.get("base_revision")
+    if not isinstance(revision, int) or isinstance(revision, bool):
+        raise InvalidChanges("base_revision(정수)이 필요합니다.")
+
+    if "content" in changes and not isinstance(changes["content"], str):
+        raise InvalidChanges("content는 문자열이어야 합니다.")
+
+    patches = changes.get("content_patch")
+    if patches is not None:
+        if not isinstance(patches, list):
+            raise InvalidChanges("content_patch는 목록이어야 합니다.")
+        for patch in patches:
+            if not isinstance(patch, dict):
+                raise InvalidChanges("content_patch 항목은 객체여야 합니다.")
+            pos = patch.get("pos", 0)
+            if not isinstance(pos, int) or isinstance(pos, bool) or pos < 0:
+                raise InvalidChanges("content_patch.pos는 0 이상의 정수여야 합니다.")
+            for field in ("before", "delete", "insert"):
+                if not isinstance(patch.get(field, ""), str):
+                    raise InvalidChanges(f"content_patch.{field}는 문자열이어야 합니다.")
+
+    for key in ("tags", "image_urls"):
+        value = changes.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, dict):
+            raise InvalidChanges(f"{key}는 {{\"add\": [...], \"remove\": [...]}} 형식이어야 합니다.")
+        for op in ("add", "remove"):
+            if not _is_str_list(value.get(op, [])):
+                raise InvalidChanges(f"{key}.{op}는 문자열 목록이어야 합니다.")
+
+
+def apply_note_changes(note: Optional[Dict[str, Any]], changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    노트에 변경분을 적용하고 업데이트할 필드만 반환합니다.
+
+    Args:
+        note: 현재 노트 (없으면 빈 노트로 간주)
+        changes: 클라이언트가 보낸 변경분 (base_revision 포함)
+
+    Raises:
+        InvalidChanges: 변경분 형식이 잘못되었을 때
+        NoteConflict: revision이 달라 전체 내용 교체를 병합할 수 없거나 패치가 적용되지 않을 때
+    """
+    validate_changes(changes)
+    note = note or {}
+    current_revision = note.get("revision", 0)
+    stale = changes["base_revision"] != current_revision
+    fields = {}
+
+    if "content" in changes:
+        if stale:
+            raise NoteConflict("다른 기기에서 노트가 수정되었습니다.")
+        fields["content"] = changes["content"]
+    elif changes.get("content_patch"):
+        content = note.get("content") or ""
+        for patch in changes["content_patch"]:
+            content = apply_text_patch(content, patch)
+        fields["content"] = content
+
+    for key in ("tags", "image_urls"):
+        if changes.get(key):
+            fields[key] = apply_list_changes(note.get(key) or [], changes[key])
+
+    return fields
+
+
+def save_note_changes(client, note_date: str, changes: Dict[str, Any], max_attempts: int = MAX_SAVE_ATTEMPTS) -> Dict[str, Any]:
+    """
+    변경분을 낙관적 동시성 제어로 저장하고 저장된 노트를 반환합니다.
+
+    Args:
+        client: SupabaseClient
+        note_date: 노트 날짜 (YYYY-MM-DD)
+        changes: 변경분 (base_revision 포함)
+        max_attempts: 동시 저장 시 재시도 횟수
+
+    Raises:
+        InvalidChanges: 변경분 형식이 잘못되었을 때
+        NoteConflict: 병합할 수 없는 변경 (e.note에 최신 노트)
+    """
+    validate_changes(changes)
+
+    for _ in range(max_attempts):
+        existing = client.get_daily_note_by_date(note_date)
+
+        try:
+            fields = apply_note_changes(existing, changes)
+        except NoteConflict as e:
+            raise NoteConflict(str(e), existing)
+
+        if existing:
+            if not fields:
+                return existing
+            result = client.update_daily_note_if_revision(
+                existing["id"], existing.get("revision", 0), fields
+            )
+            if result:
+                return result
+        else:
+            try:
+                return client.create_daily_note({
+                    "note_date": note_date,
+                    "content": "",
+                    "tags": [],
+                    "image_urls": [],
+                    **fields,
+                    "revision": 1
+                })
+            except Exception as e:
+                # 다른 기기가 같은 날짜 노트를 먼저 생성함 (UNIQUE 제약) - 다시 병합 시도
+                # 그 외 오류(네트워크, 권한, 컬럼 없음 등)는 충돌이 아니므로 그대로 전달
+                if getattr(e, "code", None) == UNIQUE_VIOLATION or client.get_daily_note_by_date(note_date):
+                    continue
+                raise
+
+    raise NoteConflict("동시 저장이 반복되어 실패했습니다.", client.get_daily_note_by_date(note_date))
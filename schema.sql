@@ -1,15 +1,17 @@
--- Supabase SQL Editor에서 실행하세요
+-- Supabase SQL Editor에서 실행하세요 (수동 설정용)
 -- trades 테이블 생성 (재실행 가능)
+-- 권장: `python migrate.py` 로 migrations/ 를 버전 관리하며 적용 (쿼리용 인덱스 포함)
 
 CREATE TABLE IF NOT EXISTS trades (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),  -- 마지막 수정 시각 (변경 피드)
 
     -- 기본 정보
     stock_name TEXT NOT NULL,           -- 종목명
     ticker TEXT NOT NULL,               -- 티커 (예: 005930.KS, TSLA)
     trade_date TIMESTAMP WITH TIME ZONE NOT NULL,  -- 매매일자
-    trade_type TEXT NOT NULL,           -- 구분 (매수/매도/일일요약)
+    trade_type TEXT NOT NULL,           -- 구분 (매수/매도)
 
     -- 거래 정보
     price NUMERIC DEFAULT 0,            -- 단가
@@ -27,6 +29,35 @@ CREATE INDEX IF NOT EXISTS idx_trades_ticker ON trades(ticker);
 CREATE INDEX IF NOT EXISTS idx_trades_trade_date ON trades(trade_date DESC);
 CREATE INDEX IF NOT EXISTS idx_trades_stock_name ON trades(stock_name);
 
+-- 이전 버전으로 만든 테이블에도 updated_at 추가 (재실행 가능)
+ALTER TABLE trades ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+-- 수정 시 updated_at 자동 갱신 (변경 피드 폴링 기준)
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trades_set_updated_at ON trades;
+CREATE TRIGGER trades_set_updated_at
+    BEFORE UPDATE ON trades
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_trades_updated_at ON trades(updated_at, id);
+
+-- 다른 기기 변경 사항 실시간 반영 (Supabase Realtime)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime')
+       AND NOT EXISTS (SELECT 1 FROM pg_publication_tables
+                       WHERE pubname = 'supabase_realtime' AND tablename = 'trades') THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE trades;
+    END IF;
+END $$;
+
 -- RLS (Row Level Security) 활성화
 -- 필요시 주석 해제
 -- ALTER TABLE trades ENABLE ROW LEVEL SECURITY;
@@ -36,7 +67,8 @@ CREATE INDEX IF NOT EXISTS idx_trades_stock_name ON trades(stock_name);
 -- CREATE POLICY "Enable all access" ON trades FOR ALL USING (true);
 
 COMMENT ON TABLE trades IS '주식 매매 일지 테이블';
-COMMENT ON COLUMN trades.ticker IS 'DAILY_NOTE는 일일 요약을 의미함';
+COMMENT ON COLUMN trades.ticker IS '티커 (일일 요약은 daily_notes에 저장)';
+COMMENT ON COLUMN trades.updated_at IS '마지막 수정 시각 (변경 피드 폴링 기준)';
 
 -- ============================================
 -- Storage 버킷 설정 (이미지 업로드용)
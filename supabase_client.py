@@ -26,6 +26,7 @@ class SupabaseClient:
                 - ticker: 티커
                 - trade_date: 매매일자 (ISO format)
                 - trade_type: 구분 (매수/매도)
+                  (일일 요약은 daily_notes에 저장)
                 - price: 단가
                 - quantity: 수량
                 - mood: 나의 기분
@@ -43,6 +44,7 @@ class SupabaseClient:
     def query_trades(
         self,
         search_keyword: Optional[str] = None,
+        ticker: Optional[str] = None,
         order_by: str = "trade_date",
         ascending: bool = False,
         limit: int = 100
@@ -52,6 +54,7 @@ class SupabaseClient:
 
         Args:
             search_keyword: 검색어 (티커 또는 종목명)
+            ticker: 정확히 일치하는 티커만 조회
             order_by: 정렬 기준 컬럼
             ascending: 오름차순 여부
             limit: 최대 조회 개수
@@ -64,6 +67,9 @@ class SupabaseClient:
                 f"ticker.ilike.%{search_keyword}%,stock_name.ilike.%{search_keyword}%"
             )
 
+        if ticker:
+            query = query.eq("ticker", ticker)
+
         query = query.order(order_by, desc=not ascending).limit(limit)
         response = query.execute()
 
@@ -143,6 +149,74 @@ class SupabaseClient:
 
         return public_url
 
+    # ============ 변경 피드 (updated_at 폴링) 메서드 ============
+
+    def get_latest_updated_at(self, table: str) -> Optional[str]:
+        """
+        테이블에서 가장 최근 updated_at 값을 반환합니다.
+
+        Args:
+            table: 테이블명 (trades / daily_notes)
+        """
+        response = (
+            self.client.table(table)
+            .select("updated_at")
+            .order("updated_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+
+        return response.data[0]["updated_at"] if response.data else None
+
+    def fetch_changes(
+        self,
+        table: str,
+        since: Optional[str],
+        after_id: Optional[str] = None,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        (updated_at, id) 커서 이후 변경된 행을 (updated_at, id) 오름차순으로 조회합니다.
+
+        같은 트랜잭션에서 수정된 행은 updated_at이 모두 같으므로
+        id까지 비교해야 limit보다 많은 행도 빠짐없이 넘어갈 수 있습니다.
+
+        Args:
+            table: 테이블명 (trades / daily_notes)
+            since: 커서의 updated_at (ISO format, None이면 처음부터)
+            after_id: 커서의 id (None이면 since 시각의 행부터 포함)
+            limit: 최대 조회 개수
+        """
+        query = self.client.table(table).select("*")
+
+        if since:
+            query = query.gte("updated_at", since)
+            if after_id:
+                query = query.or_(f'updated_at.gt."{since}",id.gt.{after_id}')
+
+        response = query.order("updated_at").order("id").limit(limit).execute()
+
+        return response.data if response.data else []
+
+    def fetch_existing_ids(self, table: str, ids: List[str], chunk_size: int = 100) -> List[str]:
+        """
+        주어진 ID 중 아직 존재하는 ID만 반환합니다. (삭제 감지용)
+
+        ID 목록이 GET URL에 실리므로 URL 길이 제한을 넘지 않도록 나눠서 조회합니다.
+
+        Args:
+            table: 테이블명 (trades / daily_notes)
+            ids: 확인할 ID 목록
+            chunk_size: 요청당 ID 개수
+        """
+        existing = []
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            response = self.client.table(table).select("id").in_("id", chunk).execute()
+            existing.extend(row["id"] for row in response.data or [])
+
+        return existing
+
     # ============ Daily Notes 메서드 ============
 
     def create_daily_note(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -199,6 +273,34 @@ class SupabaseClient:
 
         return response.data[0]
 
+    def update_daily_note_if_revision(
+        self,
+        note_id: str,
+        expected_revision: int,
+        data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        revision이 일치할 때만 일일 노트를 업데이트합니다.
+        (revision 증가는 daily_notes_bump_revision 트리거가 담당)
+
+        Args:
+            note_id: 수정할 노트의 ID
+            expected_revision: 클라이언트가 기준으로 삼은 revision
+            data: 업데이트할 데이터
+
+        Returns:
+            수정된 노트, 다른 저장이 먼저 반영되어 revision이 달라졌으면 None
+        """
+        response = (
+            self.client.table("daily_notes")
+            .update(data)
+            .eq("id", note_id)
+            .eq("revision", expected_revision)
+            .execute()
+        )
+
+        return response.data[0] if response.data else None
+
     def query_daily_notes(
         self,
         search_tag: Optional[str] = None,
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 모듈(note_patch, change_feed 등) import
+sys.path.insert(0, str(Path(__file__).parent.parent))
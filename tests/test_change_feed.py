@@ -0,0 +1,245 @@
+import sys
+import time
+import types
+
+import pytest
+
+from change_feed import ChangeFeed, LiveResultSet, LocalTables, RealtimeSource, TailPoller, create_change_feed
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def db():
+    return LocalTables()
+
+
+@pytest.fixture
+def feed(db):
+    feed = ChangeFeed(db).start()
+    yield feed
+    feed.stop()
+
+
+@pytest.fixture
+def poller(db):
+    # 스레드 폴링 대신 poll_once()를 직접 호출
+    poller = TailPoller(db, tables=("trades",), interval=3600, batch_size=3, reconcile_every=1)
+    events = []
+    poller.start(events.append)
+    poller.events = events
+    yield poller
+    poller.stop()
+
+
+# --- ChangeFeed ---
+
+def test_feed_dispatches_by_table(db, feed):
+    trades, notes = [], []
+    feed.subscribe("trades", trades.append)
+    feed.subscribe("daily_notes", notes.append)
+
+    db.insert("trades", {"ticker": "TSLA"})
+
+    assert [c["type"] for c in trades] == ["INSERT"]
+    assert notes == []
+
+
+def test_feed_unsubscribe_and_failing_subscriber(db, feed):
+    received = []
+
+    def broken(change):
+        raise ValueError("boom")
+
+    feed.subscribe("trades", broken)
+    unsubscribe = feed.subscribe("trades", received.append)
+    db.insert("trades", {"ticker": "A"})
+    unsubscribe()
+    db.insert("trades", {"ticker": "B"})
+
+    assert [c["record"]["ticker"] for c in received] == ["A"]
+
+
+# --- LiveResultSet ---
+
+def test_live_result_set_applies_insert_update_delete(db, feed):
+    live = LiveResultSet("trades", sort_key="trade_date").bind(feed)
+    live.load([])
+
+    row = db.insert("trades", {"ticker": "A", "trade_date": "2024-01-01"})
+    db.insert("trades", {"ticker": "B", "trade_date": "2024-01-02"})
+    db.update("trades", row["id"], {"ticker": "A2"})
+
+    assert [r["ticker"] for r in live.rows()] == ["B", "A2"]
+
+    db.delete("trades", row["id"])
+
+    assert [r["ticker"] for r in live.rows()] == ["B"]
+    assert live.version == 5
+
+
+def test_live_result_set_drops_rows_that_stop_matching(db, feed):
+    live = LiveResultSet("trades", match=lambda r: r.get("ticker") == "TSLA").bind(feed)
+    live.load([])
+
+    row = db.insert("trades", {"ticker": "TSLA"})
+    db.insert("trades", {"ticker": "AAPL"})
+    assert len(live.rows()) == 1
+
+    db.update("trades", row["id"], {"ticker": "TSLL"})
+    assert live.rows() == []
+
+
+def test_live_result_set_trims_to_limit(db, feed):
+    live = LiveResultSet("trades", sort_key="trade_date", limit=2).bind(feed)
+    live.load([])
+
+    for day in ("01", "03", "02"):
+        db.insert("trades", {"trade_date": f"2024-01-{day}"})
+
+    assert [r["trade_date"] for r in live.rows()] == ["2024-01-03", "2024-01-02"]
+    assert not live.needs_reload
+
+    version = live.version
+    db.insert("trades", {"trade_date": "2023-12-31"})
+    assert live.version == version
+
+
+def test_live_result_set_needs_reload_after_delete_from_full_set(db, feed):
+    live = LiveResultSet("trades", sort_key="trade_date", limit=2).bind(feed)
+    live.load([])
+    first = db.insert("trades", {"trade_date": "2024-01-01"})
+    db.insert("trades", {"trade_date": "2024-01-02"})
+
+    db.delete("trades", first["id"])
+
+    assert live.needs_reload
+    live.load(list(db.tables["trades"].values()))
+    assert not live.needs_reload
+
+
+# --- TailPoller ---
+
+def test_poller_pages_through_rows_sharing_updated_at(db, poller):
+    # 한 트랜잭션에서 batch_size보다 많은 행이 같은 시각으로 바뀐 경우
+    for i in range(7):
+        db.tables["trades"][f"id-{i}"] = {"id": f"id-{i}", "created_at": "t0", "updated_at": "t1"}
+
+    for _ in range(3):
+        poller.poll_once()
+
+    assert sorted(c["record"]["id"] for c in poller.events) == [f"id-{i}" for i in range(7)]
+    assert all(c["type"] == "UPDATE" for c in poller.events)
+
+
+def test_poller_emits_inserts_and_updates_once(db, poller):
+    row = db.insert("trades", {"ticker": "A"})
+    poller.poll_once()
+    db.update("trades", row["id"], {"ticker": "B"})
+    poller.poll_once()
+    poller.poll_once()
+
+    assert [(c["type"], c["record"]["ticker"]) for c in poller.events] == [("INSERT", "A"), ("UPDATE", "B")]
+
+
+def test_poller_reconciles_deletes_of_tracked_rows(db, poller):
+    feed = ChangeFeed(poller)
+    feed.running = True
+    poller._emit = feed._dispatch
+
+    rows = [db.insert("trades", {"trade_date": f"2024-01-0{i}"}) for i in range(1, 4)]
+    live = LiveResultSet("trades", sort_key="trade_date").bind(feed)
+    live.load(rows)
+    poller.poll_once()
+
+    db.tables["trades"].pop(rows[0]["id"])
+    poller.poll_once()
+
+    assert {r["id"] for r in live.rows()} == {rows[1]["id"], rows[2]["id"]}
+
+
+def test_poller_forgets_ids_on_unbind(db, poller):
+    feed = ChangeFeed(poller)
+    live = LiveResultSet("trades").bind(feed)
+    live.load([db.insert("trades", {})])
+    assert poller._tracked["trades"]
+
+    live.unbind()
+
+    assert not poller._tracked["trades"]
+
+
+# --- RealtimeSource (realtime 패키지 대체) ---
+
+class FakeChannel:
+    def __init__(self, socket):
+        self.socket = socket
+
+    def on_postgres_changes(self, event, schema, table, callback):
+        self.socket.callbacks.append(callback)
+
+    async def subscribe(self, callback):
+        callback(self.socket.status)
+
+
+class FakeRealtimeClient:
+    status = "SUBSCRIBED"
+    last = None
+
+    def __init__(self, url, key):
+        self.status = FakeRealtimeClient.status
+        self.callbacks = []
+        self.is_connected = False
+        FakeRealtimeClient.last = self
+
+    async def connect(self):
+        self.is_connected = True
+
+    def channel(self, name):
+        return FakeChannel(self)
+
+    async def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def fake_realtime(monkeypatch):
+    module = types.ModuleType("realtime")
+    module.AsyncRealtimeClient = FakeRealtimeClient
+    monkeypatch.setitem(sys.modules, "realtime", module)
+    monkeypatch.setattr(FakeRealtimeClient, "status", "SUBSCRIBED")
+    return FakeRealtimeClient
+
+
+def test_realtime_start_raises_on_channel_error(fake_realtime):
+    fake_realtime.status = "CHANNEL_ERROR"
+    source = RealtimeSource("http://localhost", "key", health_interval=0.01)
+
+    with pytest.raises(Exception, match="CHANNEL_ERROR"):
+        source.start(lambda change: None)
+    assert not source.live
+
+
+def test_realtime_falls_back_to_polling_when_socket_drops(db, fake_realtime):
+    db.url, db.key = "http://localhost", "key"
+    feed = create_change_feed(db, tables=("trades",), poll_interval=0.01)
+    feed.source.health_interval = 0.01
+    live = LiveResultSet("trades").bind(feed)
+    live.load([])
+    assert isinstance(feed.source, RealtimeSource) and live.connected
+
+    # 끊긴 사이의 변경도 폴링 커서로 받아야 함
+    row = db.insert("trades", {"ticker": "A"})
+    fake_realtime.last.is_connected = False
+
+    assert wait_until(lambda: [r["id"] for r in live.rows()] == [row["id"]])
+    assert live.connected
+    feed.stop()
+    assert not live.connected
@@ -0,0 +1,206 @@
+import pytest
+
+from note_patch import (
+    InvalidChanges,
+    NoteConflict,
+    apply_list_changes,
+    apply_note_changes,
+    apply_text_patch,
+    make_text_patch,
+    save_note_changes,
+)
+
+
+class UniqueViolation(Exception):
+    code = "23505"
+
+
+class FakeClient:
+    """save_note_changes가 사용하는 SupabaseClient 메서드만 흉내 내는 메모리 저장소"""
+
+    def __init__(self, note=None, lose_races=0, create_error=None):
+        self.note = note
+        self.lose_races = lose_races
+        self.create_error = create_error
+        self.create_calls = 0
+
+    def get_daily_note_by_date(self, note_date):
+        return dict(self.note) if self.note else None
+
+    def create_daily_note(self, data):
+        self.create_calls += 1
+        if self.create_error:
+            raise self.create_error
+        if self.note:
+            # 다른 기기가 먼저 생성한 상황
+            raise UniqueViolation()
+        self.note = {"id": "1", **data}
+        return dict(self.note)
+
+    def update_daily_note_if_revision(self, note_id, expected_revision, data):
+        if self.lose_races:
+            # 다른 기기가 먼저 저장한 상황
+            self.lose_races -= 1
+            self.note = {**self.note, "content": "remote " + self.note["content"], "revision": self.note["revision"] + 1}
+        if self.note["revision"] != expected_revision:
+            return None
+        self.note = {**self.note, **data, "revision": expected_revision + 1}
+        return dict(self.note)
+
+
+def test_make_and_apply_patch_roundtrip():
+    old = "반도체 강세, 종가베팅 고려"
+    new = "반도체 약세, 종가베팅 고려!"
+    patch = make_text_patch(old, new)
+
+    assert apply_text_patch(old, patch) == new
+    assert make_text_patch(old, old) is None
+
+
+def test_patch_only_carries_changed_part():
+    old = "a" * 10000 + "middle" + "b" * 10000
+    new = "a" * 10000 + "center" + "b" * 10000
+    patch = make_text_patch(old, new)
+
+    assert len(patch["delete"]) + len(patch["insert"]) + len(patch["before"]) < 50
+
+
+def test_patch_relocates_when_text_shifted():
+    base = "오전 메모\n오후: 관망"
+    patch = make_text_patch(base, "오전 메모\n오후: 매수")
+    shifted = "추가된 첫 줄\n" + base
+
+    assert apply_text_patch(shifted, patch) == "추가된 첫 줄\n오전 메모\n오후: 매수"
+
+
+def test_patch_conflicts_when_anchor_edited():
+    base = "오후: 관망"
+    patch = make_text_patch(base, "오후: 매수")
+
+    with pytest.raises(NoteConflict):
+        apply_text_patch("오후: 손절", patch)
+
+
+def test_patch_conflicts_when_anchor_ambiguous():
+    base = "x" * 20 + "AAA"
+    patch = make_text_patch(base, "x" * 20 + "BBB")
+    ambiguous = "x" * 20 + "AAA\n" + "x" * 20 + "AAA"
+
+    with pytest.raises(NoteConflict):
+        apply_text_patch("앞 " + ambiguous, patch)
+
+
+def test_stale_base_merges_non_overlapping_patch():
+    note = {"content": "다른 기기 추가\n내 문장", "tags": ["#a"], "revision": 3}
+    changes = {
+        "base_revision": 2,
+        "content_patch": [make_text_patch("내 문장", "내 문장 수정")],
+        "tags": {"add": ["#b"], "remove": []},
+    }
+
+    fields = apply_note_changes(note, changes)
+
+    assert fields == {"content": "다른 기기 추가\n내 문장 수정", "tags": ["#a", "#b"]}
+
+
+def test_stale_base_rejects_full_content_replace():
+    with pytest.raises(NoteConflict):
+        apply_note_changes({"content": "x", "revision": 2}, {"base_revision": 1, "content": "y"})
+
+
+def test_list_changes_keep_order():
+    assert apply_list_changes(["#a", "#b", "#c"], {"add": ["#d", "#a"], "remove": ["#b"]}) == ["#a", "#c", "#d"]
+
+
+@pytest.mark.parametrize("changes", [
+    ["not", "a", "dict"],
+    {"tags": {"add": ["#a"]}},
+    {"base_revision": "1"},
+    {"base_revision": 0, "tags": ["#a"]},
+    {"base_revision": 0, "image_urls": {"add": [1]}},
+    {"base_revision": 0, "content_patch": [{"pos": -1}]},
+    {"base_revision": 0, "content_patch": "text"},
+    {"base_revision": 0, "content": 3},
+])
+def test_invalid_changes_rejected(changes):
+    with pytest.raises(InvalidChanges):
+        apply_note_changes(None, changes)
+
+
+def test_save_creates_missing_note():
+    client = FakeClient()
+    note = save_note_changes(client, "2024-01-02", {"base_revision": 0, "content_patch": [make_text_patch("", "첫 메모")]})
+
+    assert note["content"] == "첫 메모"
+    assert note["revision"] == 1
+
+
+def test_save_retries_after_losing_revision_race():
+    client = FakeClient({"id": "1", "content": "본문", "tags": [], "image_urls": [], "revision": 1}, lose_races=1)
+    changes = {"base_revision": 1, "content_patch": [make_text_patch("본문", "본문 끝")]}
+
+    note = save_note_changes(client, "2024-01-02", changes)
+
+    assert note["content"] == "remote 본문 끝"
+    assert note["revision"] == 3
+
+
+def test_save_conflict_carries_latest_note():
+    client = FakeClient({"id": "1", "content": "오후: 손절", "tags": [], "image_urls": [], "revision": 2})
+    changes = {"base_revision": 1, "content_patch": [make_text_patch("오후: 관망", "오후: 매수")]}
+
+    with pytest.raises(NoteConflict) as exc:
+        save_note_changes(client, "2024-01-02", changes)
+
+    assert exc.value.note["content"] == "오후: 손절"
+
+
+def test_save_retries_when_note_created_concurrently():
+    client = FakeClient()
+    remote = {"id": "1", "note_date": "2024-01-02", "content": "다른 기기", "tags": [], "image_urls": [], "revision": 1}
+    original_get = client.get_daily_note_by_date
+    calls = []
+
+    def get_after_race(note_date):
+        # 처음 조회 직후 다른 기기가 같은 날짜 노트를 생성
+        calls.append(note_date)
+        if len(calls) == 1:
+            client.note = remote
+            return None
+        return original_get(note_date)
+
+    client.get_daily_note_by_date = get_after_race
+    changes = {"base_revision": 0, "tags": {"add": ["#a"], "remove": []}}
+
+    note = save_note_changes(client, "2024-01-02", changes)
+
+    assert note["content"] == "다른 기기"
+    assert note["tags"] == ["#a"]
+    assert note["revision"] == 2
+
+
+def test_save_reraises_non_conflict_create_errors():
+    error = RuntimeError('column "revision" does not exist')
+    client = FakeClient(create_error=error)
+
+    with pytest.raises(RuntimeError) as exc:
+        save_note_changes(client, "2024-01-02", {"base_revision": 0, "content": "메모"})
+
+    assert exc.value is error
+    assert client.create_calls == 1
+
+
+def test_patch_positions_are_code_points():
+    # 브라우저(makeTextPatch)와 같은 코드 포인트 단위 위치: 이모지 뒤 반복 문맥도 위치로 적용
+    text = "😀" + "x" * 20 + "ab" + "x" * 20 + "ab"
+    patch = {"pos": 43, "before": "x" * 16, "delete": "ab", "insert": "cd"}
+
+    assert make_text_patch(text, text[:-2] + "cd") == patch
+    assert apply_text_patch(text, patch) == text[:-2] + "cd"
+
+
+def test_emoji_replacement_keeps_surrogate_pairs():
+    patch = make_text_patch("a😀b", "a😁b")
+
+    assert patch == {"pos": 1, "before": "a", "delete": "😀", "insert": "😁"}
+    assert apply_text_patch("a😀b", patch) == "a😁b"
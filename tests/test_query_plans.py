@@ -0,0 +1,55 @@
+import pytest
+
+from check_query_plans import QUERY_SHAPES, find_seq_scans
+from migrate import MIGRATIONS_DIR, load_migrations
+
+
+def test_find_seq_scans_walks_nested_plans():
+    plan = {
+        "Node Type": "Limit",
+        "Plans": [{
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Index Scan", "Relation Name": "daily_notes"},
+                {"Node Type": "Seq Scan", "Relation Name": "trades"},
+            ],
+        }],
+    }
+
+    assert find_seq_scans(plan) == ["trades"]
+
+
+def test_find_seq_scans_accepts_index_only_plan():
+    plan = {"Node Type": "Bitmap Heap Scan", "Plans": [{"Node Type": "Bitmap Index Scan"}]}
+
+    assert find_seq_scans(plan) == []
+
+
+def test_query_shapes_cover_ticker_lookup():
+    # idx_trades_ticker_trade_date를 쓰는 query_trades(ticker=...) 형태
+    assert any("WHERE ticker = " in sql and "ORDER BY trade_date DESC" in sql for sql in QUERY_SHAPES.values())
+
+
+def test_load_migrations_sorts_by_numeric_version(tmp_path):
+    for name in ("10_later.sql", "2_second.sql", "001_first.sql"):
+        (tmp_path / name).write_text("SELECT 1;", encoding="utf-8")
+
+    assert [path.name for _, path in load_migrations(tmp_path)] == ["001_first.sql", "2_second.sql", "10_later.sql"]
+
+
+@pytest.mark.parametrize("names", [
+    ["initial.sql"],
+    ["001_a.sql", "1_b.sql"],
+])
+def test_load_migrations_rejects_bad_names(tmp_path, names):
+    for name in names:
+        (tmp_path / name).write_text("SELECT 1;", encoding="utf-8")
+
+    with pytest.raises(Exception):
+        load_migrations(tmp_path)
+
+
+def test_repository_migrations_are_contiguous():
+    versions = [int(version) for version, _ in load_migrations(MIGRATIONS_DIR)]
+
+    assert versions == list(range(1, len(versions) + 1))